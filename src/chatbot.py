@@ -3,95 +3,207 @@ import os
 from openai import OpenAI
 import json
 from typing import List, Dict, Union, Optional
-import base64
-from PIL import Image
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+try:
+    import orjson
+except ImportError:
+    orjson = None
+from PIL import Image, ImageOps
 import io
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 class ChatMemory:
-    def __init__(self):
-        self.conversation_history = []
+    IMAGE_TOKEN_ESTIMATE = 1000
+    IMAGE_HTML_TEMPLATE = "<img src='{}' width='400'>"
+
+    def __init__(self, max_tokens: int = 8000):
+        self.max_tokens = max_tokens
+        self.clear()
         
-    def add_message(self, role: str, content: Union[str, List], has_image: bool = False, hide_prompt: bool = False):
-        if not has_image:
-            self.conversation_history = [
-                msg for msg in self.conversation_history
-                if not (isinstance(msg["content"], list) and len(msg["content"]) > 1)
+    def add_message(self, role: str, content: Union[str, List], has_image: bool = False, hide_prompt: bool = False,
+                    display_only: bool = False):
+        # _image_msg_count tracks multi-part (image) messages so text-only chats skip the scan.
+        if not has_image and self._image_msg_count:
+            keep = [
+                i for i, c in enumerate(self.contents)
+                if not (isinstance(c, list) and len(c) > 1)
             ]
+            self._image_msg_count = 0
+            if len(keep) < len(self.contents):
+                self.roles = [self.roles[i] for i in keep]
+                self.contents = [self.contents[i] for i in keep]
+                self.has_image = bytearray(self.has_image[i] for i in keep)
+                self.hide_prompt = bytearray(self.hide_prompt[i] for i in keep)
+                self.display_only = bytearray(self.display_only[i] for i in keep)
+                self.tokens = [self.tokens[i] for i in keep]
+                self.api_forms = [self.api_forms[i] for i in keep]
+                self.image_html = [self.image_html[i] for i in keep]
+                self._display_cache = []
+                self._display_cursor = 0
         
-        self.conversation_history.append({
-            "role": role,
-            "content": content,
-            "has_image": has_image,
-            "hide_prompt": hide_prompt
-        })
+        # Derive everything before appending so a failure cannot leave the arrays misaligned.
+        tokens = self._estimate_tokens(content)
+        api_form = {"role": role, "content": self._api_content(content, has_image)}
+        image_html = self._image_html(content, hide_prompt)
+
+        if isinstance(content, list) and len(content) > 1:
+            self._image_msg_count += 1
+        self.roles.append(role)
+        self.contents.append(content)
+        self.has_image.append(bool(has_image))
+        self.hide_prompt.append(bool(hide_prompt))
+        self.display_only.append(bool(display_only))
+        self.tokens.append(tokens)
+        self.api_forms.append(api_form)
+        self.image_html.append(image_html)
         
     def get_history(self) -> List[Dict]:
-        return self.conversation_history
+        return [
+            {"role": role, "content": content, "has_image": bool(has_image), "hide_prompt": bool(hide_prompt),
+             "display_only": bool(display_only)}
+            for role, content, has_image, hide_prompt, display_only
+            in zip(self.roles, self.contents, self.has_image, self.hide_prompt, self.display_only)
+        ]
+
+    def _estimate_tokens(self, content: Union[str, List]) -> int:
+        # Rough chars/4 heuristic; base64 image payloads get a flat estimate instead.
+        if isinstance(content, list):
+            tokens = 0
+            for part in content:
+                if part.get("type") == "image_url":
+                    tokens += self.IMAGE_TOKEN_ESTIMATE
+                else:
+                    tokens += len(str(part.get("text") or "")) // 4
+            return tokens
+        return len(str(content)) // 4
+
+    @staticmethod
+    def _api_content(content: Union[str, List], has_image: bool) -> Union[str, List]:
+        if isinstance(content, list) and not has_image:
+            return content[0]["text"]
+        return content
+
+    @classmethod
+    def _image_html(cls, content: Union[str, List], hide_prompt: bool) -> Optional[str]:
+        if not isinstance(content, list):
+            return None
+        if hide_prompt:
+            for part in content:
+                if part.get("type") == "image_url":
+                    return cls.IMAGE_HTML_TEMPLATE.format(part["image_url"]["url"])
+            return None
+        if len(content) > 1:
+            return cls.IMAGE_HTML_TEMPLATE.format(content[1]["image_url"]["url"])
+        return None
+
+    def _trimmed_indices(self) -> List[int]:
+        # Display-only messages (e.g. batch results) are shown in the chat but never sent to the API.
+        pinned = [i for i, role in enumerate(self.roles) if role == "system" and not self.display_only[i]]
+        budget = self.max_tokens - sum(self.tokens[i] for i in pinned)
+        tail = []
+        for i in range(len(self.roles) - 1, -1, -1):
+            if self.roles[i] == "system" or self.display_only[i]:
+                continue
+            if tail and self.tokens[i] > budget:
+                break
+            budget -= self.tokens[i]
+            tail.append(i)
+        tail.reverse()
+        return pinned + tail
+
+    def get_api_messages(self) -> List[Dict]:
+        return [self.api_forms[i] for i in self._trimmed_indices()]
         
     def clear(self):
-        self.conversation_history = []
+        self.roles = []
+        self.contents = []
+        self.has_image = bytearray()
+        self.hide_prompt = bytearray()
+        self.display_only = bytearray()
+        self.tokens = []
+        self.api_forms = []
+        self.image_html = []
+        self._image_msg_count = 0
+        self._display_cache = []
+        self._display_cursor = 0
+        self.image_description_key = None
+        self.image_description = None
+        self.image_description_form = None
+
+    def image_description_in_context(self) -> bool:
+        form = self.image_description_form
+        return form is not None and any(api_form is form for api_form in self.get_api_messages())
 
     def get_display_history(self) -> List[tuple]:
-        display_history = []
-        for msg in self.conversation_history:
-            if msg["role"] == "user":
-                if isinstance(msg["content"], list):
-                    if msg.get("hide_prompt"):
-                        has_shown_image = False
-                        for content in msg["content"]:
-                            if content.get("type") == "image_url" and not has_shown_image:
-                                image_url = content["image_url"]["url"]
-                                display_history.append((f"<img src='{image_url}' width='400'>", None))
-                                has_shown_image = True
+        # Only render messages added since the last call; a purge resets the cursor.
+        display_history = self._display_cache
+        for i in range(self._display_cursor, len(self.roles)):
+            role, msg_content, image_html = self.roles[i], self.contents[i], self.image_html[i]
+            if role == "user":
+                if isinstance(msg_content, list):
+                    if self.hide_prompt[i]:
+                        if image_html is not None:
+                            display_history.append((image_html, None))
                     else:
-                        text = msg["content"][0]["text"]
-                        if len(msg["content"]) > 1:
-                            image_url = msg["content"][1]["image_url"]["url"]
-                            display_history.append((text, None))
-                            display_history.append((f"<img src='{image_url}' width='400'>", None))
-                        else:
-                            display_history.append((text, None))
+                        display_history.append((msg_content[0]["text"], None))
+                        if image_html is not None:
+                            display_history.append((image_html, None))
                 else:
-                    display_history.append((msg["content"], None))
+                    display_history.append((msg_content, None))
             else:
-                if isinstance(msg["content"], list):
-                    display_history.append((None, msg["content"][0]["text"]))
+                if isinstance(msg_content, list):
+                    display_history.append((None, msg_content[0]["text"]))
                 else:
-                    display_history.append((None, msg["content"]))
-        return display_history
+                    display_history.append((None, msg_content))
+        self._display_cursor = len(self.roles)
+        # Hand out a copy so callers appending to the result cannot corrupt the cache.
+        return list(display_history)
 
 
 class ChatInterface:
+    DEFAULT_MODELS = (
+        "google/gemini-2.0-flash-001",
+        "openai/o1",
+        "openai/o3-mini-high",
+        "deepseek/deepseek-r1",
+        "deepseek/deepseek-r1-distill-llama-70b",
+        "anthropic/claude-3.7-sonnet",
+        "openai/gpt-4o-mini",
+        "openai/gpt-4o-2024-11-20",
+        "x-ai/grok-2-vision-1212",
+        "mistralai/pixtral-large-2411",
+        "qwen/qvq-72b-preview",
+        "custom"
+    )
+    VISION_MODELS = frozenset({
+        "google/gemini-2.0-flash-001",
+        "openai/o1",
+        "openai/o3-mini-high",
+        "anthropic/claude-3.7-sonnet",
+        "openai/gpt-4o-2024-11-20",
+        "qwen/qvq-72b-preview",
+        "mistralai/pixtral-large-2411",
+        "x-ai/grok-2-vision-1212"
+    })
+    RESPONSE_CACHE_SIZE = 256
+    IMAGE_CACHE_SIZE = 8
+    IMAGE_FINGERPRINT_BYTES = 64 * 1024
+    # Maximum batch API calls in flight at once. This is a concurrency cap, not a requests-per-minute limit.
+    BATCH_CONCURRENCY = 4
+
     def __init__(self):
         self.memory = ChatMemory()
         self.client = None
-        self.default_models = [
-            "google/gemini-2.0-flash-001",
-            "openai/o1",
-            "openai/o3-mini-high",
-            "deepseek/deepseek-r1",
-            "deepseek/deepseek-r1-distill-llama-70b",
-            "anthropic/claude-3.7-sonnet",
-            "openai/gpt-4o-mini",
-            "openai/gpt-4o-2024-11-20",
-            "x-ai/grok-2-vision-1212",
-            "mistralai/pixtral-large-2411",
-            "qwen/qvq-72b-preview",
-            "custom"
-        ]
-        self.vision_models = {
-            "google/gemini-2.0-flash-001": True,
-            "openai/o1": True,
-            "openai/o3-mini-high": True,
-            "deepseek/deepseek-r1": False,
-            "deepseek/deepseek-r1-distill-llama-70b": False,
-            "anthropic/claude-3.7-sonnet": True,
-            "openai/gpt-4o-mini": False,
-            "openai/gpt-4o-2024-11-20": True,
-            "qwen/qvq-72b-preview": True,
-            "mistralai/pixtral-large-2411": True,
-            "x-ai/grok-2-vision-1212": True
-        }
+        self._vision_client = None
+        self._resp_cache = OrderedDict()
+        self._img_cache = OrderedDict()
+        # Separate pool so a long batch never queues interactive image work behind it.
+        self._batch_executor = ThreadPoolExecutor(max_workers=self.BATCH_CONCURRENCY)
         
     def initialize_client(self, base_url: str, api_key: str) -> str:
         try:
@@ -99,21 +211,152 @@ class ChatInterface:
                 base_url=base_url,
                 api_key=api_key
             )
+            self._vision_client = OpenAI(
+                base_url="https://openrouter.ai/api/v1",
+                api_key=api_key
+            )
             return "API configured successfully!"
         except Exception as e:
             return f"Error configuring API: {str(e)}"
 
-    def get_image_description(self, image_path: str) -> str:
-        try:
-            vision_client = OpenAI(
-                base_url="https://openrouter.ai/api/v1",
-                api_key=self.client.api_key
+    def _response_cache_key(self, model: str, api_messages: List[Dict]) -> str:
+        if orjson is not None:
+            payload = orjson.dumps(api_messages, option=orjson.OPT_SORT_KEYS)
+        else:
+            payload = json.dumps(api_messages, sort_keys=True).encode()
+        digest = hashlib.sha256(payload).hexdigest()
+        return f"{digest}|{model}"
+
+    def _cache_response(self, key: str, assistant_message: str):
+        self._resp_cache[key] = assistant_message
+        self._resp_cache.move_to_end(key)
+        if len(self._resp_cache) > self.RESPONSE_CACHE_SIZE:
+            self._resp_cache.popitem(last=False)
+
+    def _create_completion(self, model: str, api_messages: List[Dict], **kwargs):
+        if model.startswith("openai/"):
+            return self.client.chat.completions.create(
+                model=model,
+                messages=api_messages,
+                extra_headers={
+                    "HTTP-Referer": "localhost",
+                    "X-Title": "Gradio Chat Interface",
+                },
+                extra_body={},
+                **kwargs
             )
+        return self.client.chat.completions.create(
+            model=model,
+            messages=api_messages,
+            extra_headers={
+                "HTTP-Referer": "localhost",
+                "X-Title": "Gradio Chat Interface",
+            },
+            **kwargs
+        )
+
+    def _complete_prompt(self, model: str, prompt: str) -> str:
+        completion = self._create_completion(model, [{"role": "user", "content": prompt}])
+        if not completion or not completion.choices:
+            return "No response from API"
+        return completion.choices[0].message.content or "No response from API"
+
+    def process_batch(self,
+                      batch_input: str,
+                      history: List,
+                      model_name: str,
+                      custom_model: str = "") -> tuple:
+        if not self.client:
+            return history, "Please configure API settings first."
+
+        prompts = [line.strip() for line in (batch_input or "").splitlines() if line.strip()]
+        if not prompts:
+            return history, "No prompts to send. Enter one prompt per line."
+
+        try:
+            actual_model = custom_model if model_name == "custom" else model_name
+            futures = [
+                self._batch_executor.submit(self._complete_prompt, actual_model, prompt)
+                for prompt in prompts
+            ]
+            errors = []
+            for prompt, future in zip(prompts, futures):
+                try:
+                    reply = future.result()
+                except Exception as e:
+                    reply = f"Error in API call: {str(e)}"
+                    errors.append(reply)
+                self.memory.add_message("user", [{"type": "text", "text": prompt}], display_only=True)
+                self.memory.add_message("assistant", [{"type": "text", "text": reply}], display_only=True)
+            return self.memory.get_display_history(), "\n".join(errors)
+        except Exception as e:
+            return history, f"Error: {str(e)}"
+
+    def _prepare_image(self, image_path: str, max_edge: int = 1024, quality: int = 85) -> Optional[bytes]:
+        # Downscale and re-encode as JPEG before base64 so the vision payload stays small.
+        # Returns None when the file is already a small JPEG and can be sent as-is.
+        with Image.open(image_path) as img:
+            upright = img.getexif().get(0x0112, 1) == 1
+            if img.format == "JPEG" and upright and max(img.size) <= max_edge:
+                return None
+            # Re-encoding drops EXIF, so bake the orientation into the pixels first.
+            img = ImageOps.exif_transpose(img)
+            # JPEG has no alpha; flatten transparent images onto white instead of the hidden RGB.
+            if img.mode in ("RGBA", "LA", "PA") or (img.mode == "P" and "transparency" in img.info):
+                rgba = img.convert("RGBA")
+                img = Image.new("RGB", rgba.size, (255, 255, 255))
+                img.paste(rgba, mask=rgba.getchannel("A"))
+            # Convert before resizing: Pillow falls back to NEAREST for P and 1 modes,
+            # which drops the thin bond lines in structure drawings.
+            img = img.convert("RGB")
+            if max(img.size) > max_edge:
+                img.thumbnail((max_edge, max_edge), Image.LANCZOS)
+            buf = io.BytesIO()
+            img.save(buf, "JPEG", quality=quality, optimize=True)
+            return buf.getvalue()
+
+    @staticmethod
+    def _stream_b64(image_path: str, chunk_size: int = 48 * 1024) -> str:
+        # chunk_size is a multiple of 3, so no padding appears mid-stream. Decoding each chunk
+        # means the raw file bytes are never held whole, but the encoded chunks and the joined
+        # string still coexist, so peak memory stays about 2.7x the file size.
+        parts = []
+        with open(image_path, "rb") as image_file:
+            while chunk := image_file.read(chunk_size):
+                parts.append(base64.b64encode(chunk).decode('ascii'))
+        return "".join(parts)
+
+    def _image_key(self, image_path: str) -> bytes:
+        # Gradio writes every submit to a fresh temp path, so key on content rather than path.
+        with open(image_path, "rb") as image_file:
+            head = image_file.read(self.IMAGE_FINGERPRINT_BYTES)
+        digest = hashlib.blake2b(head, digest_size=16)
+        digest.update(str(os.path.getsize(image_path)).encode())
+        return digest.digest()
+
+    def _image_data_uri(self, image_path: str, key: Optional[bytes] = None) -> str:
+        if key is None:
+            key = self._image_key(image_path)
+        data_uri = self._img_cache.get(key)
+        if data_uri is None:
+            prepared = self._prepare_image(image_path)
+            if prepared is None:
+                image_data = self._stream_b64(image_path)
+            else:
+                image_data = base64.b64encode(prepared).decode('ascii')
+            data_uri = f"data:image/jpeg;base64,{image_data}"
+            self._img_cache[key] = data_uri
+            if len(self._img_cache) > self.IMAGE_CACHE_SIZE:
+                self._img_cache.popitem(last=False)
+        else:
+            self._img_cache.move_to_end(key)
+        return data_uri
+
+    def get_image_description(self, image_path: str, image_key: Optional[bytes] = None) -> str:
+        try:
+            image_url = self._image_data_uri(image_path, image_key)
             
-            with open(image_path, "rb") as image_file:
-                image_data = base64.b64encode(image_file.read()).decode('utf-8')
-            
-            completion = vision_client.chat.completions.create(
+            completion = self._vision_client.chat.completions.create(
                 model="qwen/qwen2.5-vl-72b-instruct:free",
                 messages=[{
                     "role": "user",
@@ -121,7 +364,7 @@ class ChatInterface:
                         {"type": "text", "text": "Please describe this image. If the image contains chemical structures, please provide as much detail as possible and give an accurate response."},
                         {
                             "type": "image_url",
-                            "image_url": {"url": f"data:image/jpeg;base64,{image_data}"}
+                            "image_url": {"url": image_url}
                         }
                     ]
                 }]
@@ -130,99 +373,119 @@ class ChatInterface:
         except Exception as e:
             return f"Error getting image description: {str(e)}"
 
-    def process_message(self, 
+    def stream_message(self,
                         user_input: str,
                         image: Optional[str],
                         multimodal_enabled: bool,
                         history: List,
                         model_name: str,
-                        custom_model: str = "") -> tuple:
+                        custom_model: str = ""):
         if not self.client:
-            return None, "Please configure API settings first."
+            yield None, "Please configure API settings first."
+            return
 
         try:
             actual_model = custom_model if model_name == "custom" else model_name
+            use_image = multimodal_enabled and image is not None
+            is_vision_model = actual_model in ChatInterface.VISION_MODELS
+            describes_image = False
             message_content = []
             
             if user_input:
                 message_content.append({"type": "text", "text": user_input})
             
-            if multimodal_enabled and image is not None:
-                is_vision_model = self.vision_models.get(actual_model, False)
+            if use_image:
                 try:
-                    with open(image, "rb") as img_file:
-                        img_data = base64.b64encode(img_file.read()).decode('utf-8')
-                    
                     if not is_vision_model:
-                        image_description = self.get_image_description(image)
-                        message_content = [{
-                            "type": "text",
-                            "text": f"{user_input}\n[Image Description: {image_description}]"
-                        }]
+                        image_key = self._image_key(image)
+                        if (self.memory.image_description_key == image_key
+                                and self.memory.image_description_in_context()):
+                            # The description is already in the API history; send only the question.
+                            message_content = [{"type": "text", "text": user_input}]
+                        else:
+                            # Re-adding the stored description (e.g. after it was trimmed) keeps
+                            # the prefix byte-identical for provider-side prompt caching.
+                            if self.memory.image_description_key != image_key:
+                                image_description = self.get_image_description(image, image_key)
+                                if not image_description.startswith("Error getting image description"):
+                                    self.memory.image_description_key = image_key
+                                    self.memory.image_description = image_description
+                            else:
+                                image_description = self.memory.image_description
+                            message_content = [{
+                                "type": "text",
+                                "text": f"[Image Description: {image_description}]\n\nUser question: {user_input}"
+                            }]
+                            describes_image = self.memory.image_description_key == image_key
                     else:
                         message_content.append({
                             "type": "image_url",
-                            "image_url": {"url": f"data:image/png;base64,{img_data}"}
+                            "image_url": {"url": self._image_data_uri(image)}
                         })
                 except Exception as e:
-                    return history, f"Error processing image: {str(e)}"
+                    yield history, f"Error processing image: {str(e)}"
+                    return
             
             self.memory.add_message(
                 "user",
                 message_content,
-                has_image=(multimodal_enabled and image is not None)
+                has_image=use_image
             )
+            if describes_image:
+                self.memory.image_description_form = self.memory.api_forms[-1]
 
             try:
-                api_messages = []
-                for msg in self.memory.get_history():
-                    api_msg = {"role": msg["role"]}
-                    if isinstance(msg["content"], list):
-                        if msg["has_image"]:
-                            api_msg["content"] = msg["content"]
-                        else:
-                            api_msg["content"] = msg["content"][0]["text"]
-                    else:
-                        api_msg["content"] = msg["content"]
-                    api_messages.append(api_msg)
-
-                if actual_model.startswith("openai/"):
-                    completion = self.client.chat.completions.create(
-                        model=actual_model,
-                        messages=api_messages,
-                        extra_headers={
-                            "HTTP-Referer": "localhost",
-                            "X-Title": "Gradio Chat Interface",
-                        },
-                        extra_body={}
-                    )
-                else:
-                    completion = self.client.chat.completions.create(
-                        model=actual_model,
-                        messages=api_messages,
-                        extra_headers={
-                            "HTTP-Referer": "localhost",
-                            "X-Title": "Gradio Chat Interface",
-                        }
-                    )
+                api_messages = self.memory.get_api_messages()
+
+                cache_key = self._response_cache_key(actual_model, api_messages)
+                assistant_message = self._resp_cache.get(cache_key)
+                if assistant_message is not None:
+                    self._resp_cache.move_to_end(cache_key)
+                    self.memory.add_message("assistant", [{"type": "text", "text": assistant_message}])
+                    yield self.memory.get_display_history(), ""
+                    return
+
+                completion = self._create_completion(actual_model, api_messages, stream=True)
+
+                assistant_message = ""
+                for chunk in completion:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content or ""
+                    if delta:
+                        assistant_message += delta
+                        yield self.memory.get_display_history() + [(None, assistant_message)], ""
 
-                if completion and completion.choices:
-                    assistant_message = completion.choices[0].message.content
+                if assistant_message:
+                    self._cache_response(cache_key, assistant_message)
                     self.memory.add_message("assistant", [{"type": "text", "text": assistant_message}])
-                    return self.memory.get_display_history(), ""
+                    yield self.memory.get_display_history(), ""
+                    return
                 else:
                     error_msg = "No response from API"
                     self.memory.add_message("assistant", [{"type": "text", "text": error_msg}])
-                    return self.memory.get_display_history(), error_msg
+                    yield self.memory.get_display_history(), error_msg
                     
             except Exception as e:
                 error_msg = f"Error in API call: {str(e)}"
                 self.memory.add_message("assistant", [{"type": "text", "text": error_msg}])
-                return self.memory.get_display_history(), error_msg
+                yield self.memory.get_display_history(), error_msg
 
         except Exception as e:
             error_msg = f"Error: {str(e)}"
-            return history, error_msg
+            yield history, error_msg
+
+    def process_message(self, 
+                        user_input: str,
+                        image: Optional[str],
+                        multimodal_enabled: bool,
+                        history: List,
+                        model_name: str,
+                        custom_model: str = "") -> tuple:
+        result = history, "No response from API"
+        for result in self.stream_message(user_input, image, multimodal_enabled, history, model_name, custom_model):
+            pass
+        return result
 
     def create_interface(self):
         with gr.Blocks() as interface:
@@ -241,6 +504,7 @@ class ChatInterface:
                     )
                 with gr.Column(scale=1):
                     submit_btn = gr.Button("Send")
+                    batch_btn = gr.Button("Send as Batch")
                     clear_btn = gr.Button("Clear")
 
             # 图片输入选项
@@ -265,7 +529,7 @@ class ChatInterface:
                     type="password"
                 )
                 model_select = gr.Dropdown(
-                    choices=self.default_models,
+                    choices=list(ChatInterface.DEFAULT_MODELS),
                     label="Select Model",
                     value="google/gemini-2.0-flash-thinking-exp:free"
                 )
@@ -297,7 +561,6 @@ class ChatInterface:
 
             def clear_chat(self):
                 self.chat_interface.memory.clear()
-                self.chat_interface.memory.conversation_history = []
                 return None, "", gr.update(value=False), gr.update(visible=False)
             model_select.change(
                 update_model_input,
@@ -312,7 +575,7 @@ class ChatInterface:
             )
 
             submit_btn.click(
-                self.process_message,
+                self.stream_message,
                 inputs=[
                     msg,
                     image_input,
@@ -325,7 +588,7 @@ class ChatInterface:
             )
 
             msg.submit(
-                self.process_message,
+                self.stream_message,
                 inputs=[
                     msg,
                     image_input,
@@ -337,6 +600,17 @@ class ChatInterface:
                 outputs=[chatbot, error_box]
             )
 
+            batch_btn.click(
+                self.process_batch,
+                inputs=[
+                    msg,
+                    chatbot,
+                    model_select,
+                    custom_model
+                ],
+                outputs=[chatbot, error_box]
+            )
+
             clear_btn.click(
                 fn=self.clear_chat,
                 outputs=[chatbot, error_box, multimodal_enabled, image_input]
@@ -157,6 +157,7 @@ class IntegratedInterface:
                         )
                     with gr.Column(scale=1):
                         submit_btn = gr.Button("Send")
+                        batch_btn = gr.Button("Send as Batch")
                         clear_btn = gr.Button("Clear")
 
                 multimodal_enabled = gr.Checkbox(
@@ -180,7 +181,7 @@ class IntegratedInterface:
                         type="password"
                     )
                     model_select = gr.Dropdown(
-                        choices=self.chat_interface.default_models,
+                        choices=list(ChatInterface.DEFAULT_MODELS),
                         label="Select Model",
                         value="google/gemini-2.0-flash-thinking-exp:free"
                     )
@@ -436,7 +437,7 @@ class IntegratedInterface:
             )
 
             submit_btn.click(
-                fn=self.chat_interface.process_message,
+                fn=self.chat_interface.stream_message,
                 inputs=[
                     msg,
                     image_input,
@@ -449,7 +450,7 @@ class IntegratedInterface:
             )
 
             msg.submit(
-                fn=self.chat_interface.process_message,
+                fn=self.chat_interface.stream_message,
                 inputs=[
                     msg,
                     image_input,
@@ -461,6 +462,17 @@ class IntegratedInterface:
                 outputs=[chatbot, error_box]
             )
 
+            batch_btn.click(
+                fn=self.chat_interface.process_batch,
+                inputs=[
+                    msg,
+                    chatbot,
+                    model_select,
+                    custom_model
+                ],
+                outputs=[chatbot, error_box]
+            )
+
             clear_btn.click(
                 fn=lambda: (None, "", gr.update(value=False), gr.update(visible=False)),
                 outputs=[chatbot, error_box, multimodal_enabled, image_input]